@@ -8,23 +8,38 @@ This module implements a gateway server that:
 """
 
 import asyncio
+import hashlib
+import itertools
 import json
 import os
 import logging
 import signal
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 
+import orjson
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from mcp.types import Tool
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.environ.get("MCP_LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+# Backoff schedule for the startup tools/list readiness probe (50 ms, 100 ms, ...)
+PROBE_INITIAL_DELAY = 0.05
+PROBE_MAX_ATTEMPTS = 10
+
+# Pre-encoded framing for tools/call, the hot RPC method
+_TOOLS_CALL_PREFIX = b'{"jsonrpc":"2.0","method":"tools/call","params":'
+
+# Header used by servers that frame stdout messages LSP-style instead of by newline
+CONTENT_LENGTH_HEADER = b"Content-Length:"
+# Pipe buffer limit, large enough for newline-framed responses such as file reads
+STREAM_LIMIT = 16 * 1024 * 1024
+
 
 @dataclass
 class MCPServerConfig:
@@ -32,6 +47,8 @@ class MCPServerConfig:
     command: str
     args: List[str]
     env: Dict[str, str] = field(default_factory=dict)
+    # Stateful servers can opt out of sharing a process with identical configs
+    no_share: bool = False
 
 
 @dataclass
@@ -41,6 +58,14 @@ class MCPServer:
     config: MCPServerConfig
     process: asyncio.subprocess.Process
     tools: List[Dict] = field(default_factory=list)
+    # In-flight requests keyed by JSON-RPC id, resolved by the stdout reader task
+    _pending: Dict[int, asyncio.Future] = field(default_factory=dict, repr=False)
+    _id_counter: Iterator[int] = field(default_factory=lambda: itertools.count(1), repr=False)
+    _reader_task: Optional[asyncio.Task] = field(default=None, repr=False)
+    # Number of configured server names sharing this process
+    _ref_count: int = field(default=0, repr=False)
+    # Key of this server's entry in the gateway's process pool
+    _pool_key: Optional[str] = field(default=None, repr=False)
 
 
 def get_schema(tool: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -54,41 +79,142 @@ def get_schema(tool: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return schema
 
 
+def _compute_mcp_hash(config: MCPServerConfig) -> str:
+    """Hash the parts of a server config that determine the spawned process."""
+    key = orjson.dumps([config.command, config.args, sorted(config.env.items())])
+    return hashlib.sha256(key).hexdigest()
+
+
+def _pool_key(name: str, config: MCPServerConfig) -> str:
+    """Key a server in the process pool; unshared servers get a key of their own."""
+    return f"{name}:unshared" if config.no_share else _compute_mcp_hash(config)
+
+
 class Gateway:
     """MCP Gateway that manages server connections and forwards requests."""
     
     def __init__(self):
         self.servers: Dict[str, MCPServer] = {}
+        # Aggregated tools/list result, rebuilt only when the server set changes
+        self._tools_cache: Optional[List[Dict]] = None
+        self._tools_cache_json: Optional[bytes] = None
+        # Maps tool name to the server that provides it
+        self._tool_index: Dict[str, MCPServer] = {}
+        # Running servers keyed by pool key (config hash, or per-name when unshared)
+        self._pool: Dict[str, MCPServer] = {}
+        
+    async def _read_message(self, stdout: asyncio.StreamReader) -> bytes:
+        """Read one message from a server, using Content-Length framing when present.
         
+        Malformed frames are logged and skipped; an empty result means EOF.
+        """
+        while True:
+            line = await stdout.readline()
+            if not line.startswith(CONTENT_LENGTH_HEADER):
+                # Newline-delimited JSON (or EOF)
+                return line
+            
+            try:
+                length = int(line[len(CONTENT_LENGTH_HEADER):])
+            except ValueError:
+                logger.error(f"Invalid Content-Length header: {line!r}")
+                continue
+            # Skip any further headers up to the blank separator line
+            while (await stdout.readline()).strip():
+                pass
+            try:
+                return await stdout.readexactly(length)
+            except asyncio.IncompleteReadError as e:
+                # The stream ended mid-body, so there is nothing more to read
+                logger.error(f"Truncated message: got {len(e.partial)} of {length} bytes")
+                return b""
+    
+    async def _read_responses(self, server: MCPServer) -> None:
+        """Read responses from a server's stdout and resolve the matching pending requests."""
+        error: Exception = Exception("Empty response")
+        try:
+            while True:
+                try:
+                    response_line = await self._read_message(server.process.stdout)
+                except ValueError as e:
+                    # readline() discards lines over the stream limit; skip them
+                    logger.error(f"Unreadable message from {server.name}: {str(e)}")
+                    continue
+                if not response_line:
+                    break
+                    
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Received response from %s: %s", server.name, response_line.decode(errors="replace").strip())
+                
+                try:
+                    response = orjson.loads(response_line)
+                except orjson.JSONDecodeError as e:
+                    logger.error(f"Invalid JSON from {server.name}: {str(e)}")
+                    continue
+                
+                # Only responses resolve pending calls; notifications and
+                # server-initiated requests carry a method
+                if not isinstance(response, dict) or "method" in response:
+                    continue
+                try:
+                    future = server._pending.pop(response.get("id"), None)
+                except TypeError:
+                    # Unhashable id, can't belong to any of our requests
+                    future = None
+                if future is None:
+                    # Response nobody is waiting for anymore
+                    continue
+                if not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            error = Exception("Server connection closed")
+            raise
+        except Exception as e:
+            logger.error(f"Error reading responses from {server.name}: {str(e)}")
+            error = e
+        finally:
+            # Fail anything still waiting so callers don't hang
+            for future in server._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            server._pending.clear()
+    
     async def _communicate_with_server(self, server: MCPServer, method: str, params: dict = None) -> Any:
         """Send a request to a server and get the response."""
         if not server.process.stdin or not server.process.stdout:
             raise Exception("Server process pipes not available")
+        if server._reader_task is None or server._reader_task.done():
+            raise Exception("Server response reader not running")
             
+        request_id = next(server._id_counter)
+        future = asyncio.get_running_loop().create_future()
+        server._pending[request_id] = future
         try:
-            # Prepare request
-            request = {
-                "jsonrpc": "2.0",
-                "method": method,
-                "params": params or {},
-                "id": 1
-            }
-            request_str = json.dumps(request) + "\n"
-            logger.info(f"Sending request to {server.name}: {request_str.strip()}")
+            # Prepare request; only params and id need encoding for tools/call.
+            # A fresh bytes object is built per request since transports such as
+            # uvloop may hold on to the written buffer until it is flushed.
+            if method == "tools/call":
+                request_bytes = (
+                    _TOOLS_CALL_PREFIX
+                    + orjson.dumps(params or {})
+                    + b',"id":%d}\n' % request_id
+                )
+            else:
+                request_bytes = orjson.dumps({
+                    "jsonrpc": "2.0",
+                    "method": method,
+                    "params": params or {},
+                    "id": request_id
+                }) + b"\n"
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sending request to %s: %s", server.name, request_bytes.decode().strip())
             
             # Send request
-            server.process.stdin.write(request_str.encode())
+            server.process.stdin.write(request_bytes)
             await server.process.stdin.drain()
             
-            # Read response
-            response_line = await server.process.stdout.readline()
-            if not response_line:
-                raise Exception("Empty response")
-                
-            response_str = response_line.decode().strip()
-            logger.info(f"Received response from {server.name}: {response_str}")
-            
-            response = json.loads(response_str)
+            # Wait for the reader task to deliver the matching response
+            response = await future
             if "error" in response:
                 raise Exception(response["error"])
                 
@@ -97,63 +223,100 @@ class Gateway:
         except Exception as e:
             logger.error(f"Error communicating with {server.name}: {str(e)}")
             raise
+        finally:
+            server._pending.pop(request_id, None)
+        
+    async def _spawn_process(self, name: str, config: MCPServerConfig) -> MCPServer:
+        """Start an MCP server process and attach its response reader."""
+        logger.info(f"Starting MCP server: {name}")
+        logger.info(f"Server config: command={config.command}, args={config.args}")
+        
+        # Get current environment and update with server-specific env vars
+        env = os.environ.copy()
+        env.update(config.env)
+        
+        # Start the server process in the background, exec'ing it directly without a shell
+        process = await asyncio.create_subprocess_exec(
+            config.command,
+            *config.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            limit=STREAM_LIMIT,
+            preexec_fn=os.setsid  # Create new process group
+        )
+        
+        # Create server object
+        server = MCPServer(
+            name=name,
+            config=config,
+            process=process
+        )
+        server._reader_task = asyncio.create_task(self._read_responses(server))
+        
+        # Start monitoring stderr in background
+        asyncio.create_task(self._monitor_stderr(server))
         
+        return server
+    
+    async def _probe_tools(self, server: MCPServer) -> None:
+        """Query a server's tools, retrying with exponential backoff until it responds."""
+        logger.info(f"Querying tools from {server.name}")
+        delay = PROBE_INITIAL_DELAY
+        for attempt in range(1, PROBE_MAX_ATTEMPTS + 1):
+            try:
+                result = await asyncio.wait_for(
+                    self._communicate_with_server(server, "tools/list"),
+                    timeout=delay
+                )
+                break
+            except Exception as e:
+                if attempt == PROBE_MAX_ATTEMPTS or server.process.returncode is not None:
+                    logger.error(f"Error querying tools from {server.name}: {str(e)}")
+                    server.tools = []
+                    return
+                if not isinstance(e, asyncio.TimeoutError):
+                    # The server answered with an error; give it time before retrying
+                    await asyncio.sleep(delay)
+                delay *= 2
+        
+        server.tools = result.get("tools", [])
+        logger.info(f"Server {server.name} tools response: {json.dumps(result, indent=2)}")
+        logger.info(f"Server {server.name} provides tools: {[t['name'] for t in server.tools]}")
+        for tool in server.tools:
+            logger.info(f"Tool details for {tool['name']}:")
+            logger.info(f"  Description: {tool.get('description', 'No description')}")
+            schema = get_schema(tool)
+            if schema:
+                logger.info(f"  Schema: {json.dumps(schema, indent=2)}")
+    
+    def _register_server(self, name: str, server: MCPServer) -> None:
+        """Make a started server and its tools available to clients under a configured name."""
+        self.servers[name] = server
+        server._ref_count += 1
+        for tool in server.tools:
+            self._tool_index.setdefault(tool["name"], server)
+        self._invalidate_tools_cache()
+    
+    def _register_pooled(self, key: str, names: List[str], server: MCPServer) -> None:
+        """Pool a server under its key and register it for every configured name sharing it."""
+        server._pool_key = key
+        self._pool[key] = server
+        for name in names:
+            self._register_server(name, server)
+    
     async def start_server(self, name: str, config: MCPServerConfig) -> MCPServer:
         """Start an MCP server and initialize its client session."""
         try:
-            logger.info(f"Starting MCP server: {name}")
-            logger.info(f"Server config: command={config.command}, args={config.args}")
-            
-            # Construct command
-            cmd = f"{config.command} {' '.join(config.args)}"
-            logger.info(f"Running command: {cmd}")
-            
-            # Get current environment and update with server-specific env vars
-            env = os.environ.copy()
-            env.update(config.env)
-            
-            # Start the server process in the background
-            process = await asyncio.create_subprocess_shell(
-                cmd,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env,
-                preexec_fn=os.setsid  # Create new process group
-            )
-            
-            # Create server object
-            server = MCPServer(
-                name=name,
-                config=config,
-                process=process
-            )
-            
-            # Wait a bit for server to initialize
-            await asyncio.sleep(2)
-            
-            # Query available tools
-            try:
-                logger.info(f"Querying tools from {name}")
-                result = await self._communicate_with_server(server, "tools/list")
-                server.tools = result.get("tools", [])
-                logger.info(f"Server {name} tools response: {json.dumps(result, indent=2)}")
-                logger.info(f"Server {name} provides tools: {[t['name'] for t in server.tools]}")
-                for tool in server.tools:
-                    logger.info(f"Tool details for {tool['name']}:")
-                    logger.info(f"  Description: {tool.get('description', 'No description')}")
-                    schema = get_schema(tool)
-                    if schema:
-                        logger.info(f"  Schema: {json.dumps(schema, indent=2)}")
-            except Exception as e:
-                logger.error(f"Error querying tools from {name}: {str(e)}")
-                server.tools = []
-            
-            self.servers[name] = server
-            
-            # Start monitoring stderr in background
-            asyncio.create_task(self._monitor_stderr(server))
-            
+            key = _pool_key(name, config)
+            server = self._pool.get(key)
+            if server is None:
+                server = await self._spawn_process(name, config)
+                await self._probe_tools(server)
+            else:
+                logger.info(f"Sharing server {server.name} process with {name}")
+            self._register_pooled(key, [name], server)
             return server
             
         except Exception as e:
@@ -162,17 +325,20 @@ class Gateway:
     
     async def _monitor_stderr(self, server: MCPServer):
         """Monitor server's stderr output."""
-        while True:
-            if server.process.stderr:
-                try:
-                    line = await server.process.stderr.readline()
-                    if line:
-                        logger.info(f"[{server.name}] {line.decode().strip()}")
-                    else:
-                        break
-                except Exception as e:
-                    logger.error(f"Error reading stderr from {server.name}: {str(e)}")
-                    break
+        stderr = server.process.stderr
+        if not stderr:
+            return
+        # Hoist loop invariants into locals for chatty servers
+        name = server.name
+        is_enabled = logger.isEnabledFor
+        log = logger.debug
+        try:
+            async for line in stderr:
+                # Skip decoding entirely unless the line will actually be logged
+                if is_enabled(logging.DEBUG):
+                    log("[%s] %s", name, line.decode().strip())
+        except Exception as e:
+            logger.error(f"Error reading stderr from {server.name}: {str(e)}")
     
     async def start_all_servers(self, config_path: str) -> None:
         """Start all configured MCP servers."""
@@ -186,84 +352,143 @@ class Gateway:
             if not config.get('mcp', {}).get('servers'):
                 raise ValueError("No MCP servers configured in config file")
                 
-            # Start each configured server in parallel
-            tasks = []
+            # Group identical configs so they share a single process
+            groups: Dict[str, List[str]] = {}
+            configs: Dict[str, MCPServerConfig] = {}
             for name, server_config in config['mcp']['servers'].items():
-                logger.info(f"Creating start task for server: {name}")
-                task = asyncio.create_task(
-                    self.start_server(
-                        name,
-                        MCPServerConfig(**server_config)
-                    )
-                )
-                tasks.append(task)
+                server_config = MCPServerConfig(**server_config)
+                key = _pool_key(name, server_config)
+                groups.setdefault(key, []).append(name)
+                configs[key] = server_config
+            
+            # Spawn one process per unique config in parallel
+            keys = list(groups)
+            spawned = await asyncio.gather(
+                *(self._spawn_process(groups[key][0], configs[key]) for key in keys),
+                return_exceptions=True
+            )
+            servers = {}
+            for key, result in zip(keys, spawned):
+                if isinstance(result, Exception):
+                    logger.error(f"Error starting server {groups[key][0]}: {str(result)}")
+                else:
+                    servers[key] = result
             
-            # Wait for all servers to start
+            # Probe all servers for their tools concurrently
             logger.info("Waiting for all servers to start")
-            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(
+                *(self._probe_tools(server) for server in servers.values()),
+                return_exceptions=True
+            )
+            for key, server in servers.items():
+                self._register_pooled(key, groups[key], server)
             logger.info("All servers started")
             
+            # Build the aggregated tools list once now that all servers are up
+            self._build_tools_cache()
+            
         except Exception as e:
             logger.error(f"Error starting servers: {str(e)}")
             raise
     
-    async def list_all_tools(self) -> List[Dict[str, Any]]:
-        """Get all available tools from all servers."""
+    def _invalidate_tools_cache(self) -> None:
+        """Drop the cached tools list after the set of servers changes."""
+        self._tools_cache = None
+        self._tools_cache_json = None
+    
+    def _build_tools_cache(self) -> None:
+        """Aggregate tools from all servers and cache the list and its JSON encoding."""
         tools = []
-        for server in self.servers.values():
+        for name, server in self.servers.items():
             for tool in server.tools:
                 tool_dict = {
                     "name": tool["name"],
                     "description": tool.get("description", ""),
-                    "server": server.name
+                    "server": name
                 }
                 schema = get_schema(tool)
                 if schema:
                     tool_dict["input_schema"] = schema
                 tools.append(tool_dict)
         logger.info(f"All available tools: {json.dumps(tools, indent=2)}")
-        return tools
+        self._tools_cache = tools
+        self._tools_cache_json = orjson.dumps({"tools": tools})
+    
+    async def list_all_tools(self) -> List[Dict[str, Any]]:
+        """Get all available tools from all servers."""
+        if self._tools_cache is None:
+            self._build_tools_cache()
+        return self._tools_cache
+    
+    async def list_all_tools_json(self) -> bytes:
+        """Get the JSON-encoded tools/list response body."""
+        if self._tools_cache_json is None:
+            self._build_tools_cache()
+        return self._tools_cache_json
     
     async def call_tool(self, tool_name: str, arguments: dict) -> Any:
         """Call a tool on the appropriate server."""
         # Find server that has this tool
-        for server in self.servers.values():
-            if any(t["name"] == tool_name for t in server.tools):
+        server = self._tool_index.get(tool_name)
+        if server is None:
+            raise ValueError(f"Tool {tool_name} not found")
+        try:
+            logger.info("Calling tool %s on server %s", tool_name, server.name)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Tool arguments: %s", json.dumps(arguments, indent=2))
+            
+            result = await self._communicate_with_server(
+                server,
+                "tools/call",
+                {
+                    "name": tool_name,
+                    "arguments": arguments
+                }
+            )
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Tool call result: %s", json.dumps(result, indent=2))
+            return result
+        except Exception as e:
+            logger.error(f"Error calling tool {tool_name}: {str(e)}")
+            raise
+    
+    async def _terminate_server(self, server: MCPServer) -> None:
+        """Stop a server's reader and kill its process group."""
+        if server._reader_task:
+            server._reader_task.cancel()
+        if server.process:
+            try:
+                # Kill entire process group
+                os.killpg(os.getpgid(server.process.pid), signal.SIGTERM)
+                await server.process.wait()
+            except Exception as e:
+                logger.error(f"Error shutting down server {server.name}: {str(e)}")
                 try:
-                    logger.info(f"Calling tool {tool_name} on server {server.name}")
-                    logger.info(f"Tool arguments: {json.dumps(arguments, indent=2)}")
-                    
-                    result = await self._communicate_with_server(
-                        server,
-                        "tools/call",
-                        {
-                            "name": tool_name,
-                            "arguments": arguments
-                        }
-                    )
-                    
-                    logger.info(f"Tool call result: {json.dumps(result, indent=2)}")
-                    return result
-                except Exception as e:
-                    logger.error(f"Error calling tool {tool_name}: {str(e)}")
-                    raise
-        raise ValueError(f"Tool {tool_name} not found")
+                    os.killpg(os.getpgid(server.process.pid), signal.SIGKILL)
+                except:
+                    pass
+    
+    async def _release_server(self, name: str) -> None:
+        """Unregister a configured server name, killing its process once unreferenced."""
+        server = self.servers.pop(name)
+        server._ref_count -= 1
+        self._invalidate_tools_cache()
+        if server._ref_count <= 0:
+            # Drop the pool entry and tool routes so nothing reaches the dead process
+            if self._pool.get(server._pool_key) is server:
+                del self._pool[server._pool_key]
+            for tool_name in [t for t, s in self._tool_index.items() if s is server]:
+                del self._tool_index[tool_name]
+            await self._terminate_server(server)
     
     async def shutdown(self) -> None:
         """Shutdown all MCP servers."""
-        for server in self.servers.values():
-            if server.process:
-                try:
-                    # Kill entire process group
-                    os.killpg(os.getpgid(server.process.pid), signal.SIGTERM)
-                    await server.process.wait()
-                except Exception as e:
-                    logger.error(f"Error shutting down server {server.name}: {str(e)}")
-                    try:
-                        os.killpg(os.getpgid(server.process.pid), signal.SIGKILL)
-                    except:
-                        pass
-        self.servers.clear()
+        for name in list(self.servers):
+            await self._release_server(name)
+        self._pool.clear()
+        self._tool_index.clear()
+        self._invalidate_tools_cache()
 
 
 # Global gateway instance
@@ -289,33 +514,32 @@ async def shutdown():
 async def message_endpoint(request: Request):
     """Handle incoming messages from clients."""
     try:
-        msg = await request.json()
-        logger.info(f"Received message: {json.dumps(msg, indent=2)}")
+        msg = orjson.loads(await request.body())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received message: %s", json.dumps(msg, indent=2))
         
         if msg.get("method") == "tools/list":
-            tools = await gateway.list_all_tools()
-            response = {"tools": tools}
-            logger.info(f"Returning tools: {json.dumps(response, indent=2)}")
-            return JSONResponse(response)
+            content = await gateway.list_all_tools_json()
+            return Response(content=content, media_type="application/json")
         
         elif msg.get("method") == "tools/call":
             params = msg.get("params", {})
-            logger.info(f"Tool call parameters: {json.dumps(params, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Tool call parameters: %s", json.dumps(params, indent=2))
             
             result = await gateway.call_tool(
                 params.get("name"),
                 params.get("arguments", {})
             )
-            logger.info(f"Tool call result: {json.dumps(result, indent=2)}")
-            return JSONResponse(result)
+            return Response(orjson.dumps(result), media_type="application/json")
         
-        return JSONResponse({"error": "Unknown method"}, status_code=400)
+        return Response(orjson.dumps({"error": "Unknown method"}), status_code=400, media_type="application/json")
     except Exception as e:
         logger.error(f"Error handling message: {str(e)}")
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return Response(orjson.dumps({"error": str(e)}), status_code=500, media_type="application/json")
 
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("MCP_PORT", "8808"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(app, host="0.0.0.0", port=port, loop="uvloop", http="httptools")
@@ -0,0 +1 @@
+"""Define any unit tests you may want in this directory."""
@@ -0,0 +1,226 @@
+import asyncio
+import contextlib
+import json
+import sys
+import textwrap
+
+import pytest
+from mcp_gateway import server as gateway_server
+from mcp_gateway.server import Gateway, MCPServerConfig
+
+# Answers every request by echoing its params back as the result
+ECHO_LOOP = """
+for line in sys.stdin:
+    r = json.loads(line)
+    print(json.dumps({"jsonrpc": "2.0", "id": r["id"], "result": r["params"]}), flush=True)
+"""
+
+
+def stub_config(*bodies: str) -> MCPServerConfig:
+    """Build a config that runs `bodies` in order as a stdio MCP server stub."""
+    code = "import json, sys\n" + "".join(textwrap.dedent(body) for body in bodies)
+    return MCPServerConfig(command=sys.executable, args=["-c", code])
+
+
+async def call(gateway, server, method, params=None, timeout=5):
+    return await asyncio.wait_for(
+        gateway._communicate_with_server(server, method, params), timeout=timeout
+    )
+
+
+async def with_stub(check, *bodies: str) -> None:
+    gateway = Gateway()
+    server = await gateway._spawn_process("stub", stub_config(*bodies))
+    try:
+        await check(gateway, server)
+    finally:
+        # Bounded so a stuck pipe can't hang the suite
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(gateway._terminate_server(server), timeout=5)
+
+
+def test_out_of_order_responses_resolve_matching_requests() -> None:
+    body = """
+    reqs = [json.loads(sys.stdin.readline()) for _ in range(3)]
+    for r in reversed(reqs):
+        print(json.dumps({"jsonrpc": "2.0", "id": r["id"], "result": r["params"]}), flush=True)
+    sys.stdin.read()
+    """
+
+    async def check(gateway, server):
+        results = await asyncio.gather(
+            *(call(gateway, server, "echo", {"n": n}) for n in range(3))
+        )
+        assert results == [{"n": 0}, {"n": 1}, {"n": 2}]
+        assert server._pending == {}
+
+    asyncio.run(with_stub(check, body))
+
+
+def test_pending_requests_fail_on_eof() -> None:
+    body = """
+    sys.stdin.readline()
+    """
+
+    async def check(gateway, server):
+        with pytest.raises(Exception, match="Empty response"):
+            await call(gateway, server, "echo")
+        assert server._pending == {}
+
+    asyncio.run(with_stub(check, body))
+
+
+def test_reader_skips_bad_and_server_initiated_messages() -> None:
+    body = """
+    r = json.loads(sys.stdin.readline())
+    print("not json", flush=True)
+    print("[1, 2]", flush=True)
+    print(json.dumps({"id": [1]}), flush=True)
+    print(json.dumps({"jsonrpc": "2.0", "id": r["id"], "method": "roots/list"}), flush=True)
+    print(json.dumps({"jsonrpc": "2.0", "id": r["id"], "result": "ok"}), flush=True)
+    """
+
+    async def check(gateway, server):
+        assert await call(gateway, server, "first") == "ok"
+        assert await call(gateway, server, "echo", {"a": 1}) == {"a": 1}
+
+    asyncio.run(with_stub(check, body, ECHO_LOOP))
+
+
+def test_reader_survives_oversized_line(monkeypatch) -> None:
+    monkeypatch.setattr(gateway_server, "STREAM_LIMIT", 1024)
+    body = """
+    r = json.loads(sys.stdin.readline())
+    print(json.dumps({"jsonrpc": "2.0", "id": r["id"], "result": "x" * 100000}), flush=True)
+    """
+
+    async def check(gateway, server):
+        with pytest.raises(asyncio.TimeoutError):
+            await call(gateway, server, "big", timeout=0.5)
+        for n in range(2):
+            assert await call(gateway, server, "echo", {"n": n}) == {"n": n}
+
+    asyncio.run(with_stub(check, body, ECHO_LOOP))
+
+
+def test_pool_key_ignores_env_order_but_not_args_order() -> None:
+    a = MCPServerConfig(command="srv", args=["x", "y"], env={"A": "1", "B": "2"})
+    b = MCPServerConfig(command="srv", args=["x", "y"], env={"B": "2", "A": "1"})
+    c = MCPServerConfig(command="srv", args=["y", "x"], env={"A": "1", "B": "2"})
+    assert gateway_server._pool_key("a", a) == gateway_server._pool_key("b", b)
+    assert gateway_server._pool_key("a", a) != gateway_server._pool_key("a", c)
+
+    unshared = MCPServerConfig(command="srv", args=["x", "y"], no_share=True)
+    assert gateway_server._pool_key("a", unshared) != gateway_server._pool_key("b", unshared)
+
+
+def test_identical_configs_share_a_process(tmp_path) -> None:
+    shared = stub_config(ECHO_LOOP)
+    servers = {
+        "first": {"command": shared.command, "args": shared.args},
+        "second": {"command": shared.command, "args": shared.args},
+        "private": {"command": shared.command, "args": shared.args, "no_share": True},
+    }
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"mcp": {"servers": servers}}))
+
+    async def run():
+        gateway = Gateway()
+        await gateway.start_all_servers(str(config_path))
+        try:
+            first = gateway.servers["first"]
+            assert gateway.servers["second"] is first
+            assert first._ref_count == 2
+            assert gateway.servers["private"] is not first
+            assert len(gateway._pool) == 2
+
+            # Only the last release kills the shared process
+            await gateway._release_server("first")
+            assert first.process.returncode is None
+            await gateway._release_server("second")
+            assert first.process.returncode is not None
+            assert first._pool_key not in gateway._pool
+
+            # A later start with the same config spawns a fresh process
+            restarted = await gateway.start_server("first", shared)
+            assert restarted is not first
+            assert restarted.process.returncode is None
+        finally:
+            await asyncio.wait_for(gateway.shutdown(), timeout=5)
+
+    asyncio.run(run())
+
+
+def test_released_tools_are_unrouted_until_restart() -> None:
+    body = """
+    for line in sys.stdin:
+        r = json.loads(line)
+        if r["method"] == "tools/list":
+            result = {"tools": [{"name": "t1"}]}
+        else:
+            result = {"content": [{"type": "text", "text": r["params"]["name"]}]}
+        print(json.dumps({"jsonrpc": "2.0", "id": r["id"], "result": result}), flush=True)
+    """
+    config = stub_config(body)
+
+    async def run():
+        gateway = Gateway()
+        try:
+            await gateway.start_server("a", config)
+            assert [t["name"] for t in await gateway.list_all_tools()] == ["t1"]
+            assert (await gateway.call_tool("t1", {}))["content"][0]["text"] == "t1"
+
+            await gateway._release_server("a")
+            assert await gateway.list_all_tools() == []
+            with pytest.raises(ValueError, match="Tool t1 not found"):
+                await gateway.call_tool("t1", {})
+
+            await gateway.start_server("a", config)
+            assert [t["name"] for t in await gateway.list_all_tools()] == ["t1"]
+            result = await asyncio.wait_for(gateway.call_tool("t1", {}), timeout=5)
+            assert result["content"][0]["text"] == "t1"
+        finally:
+            await asyncio.wait_for(gateway.shutdown(), timeout=5)
+
+    asyncio.run(run())
+
+
+def test_mixed_framed_and_newline_responses() -> None:
+    body = """
+    def framed(payload):
+        data = json.dumps(payload).encode()
+        sys.stdout.buffer.write(b"Content-Length: %d\\r\\n\\r\\n" % len(data) + data)
+        sys.stdout.flush()
+
+    for i, line in enumerate(sys.stdin):
+        r = json.loads(line)
+        response = {"jsonrpc": "2.0", "id": r["id"], "result": r["params"]}
+        if i == 0:
+            # A bad header is skipped without taking the reader down
+            sys.stdout.buffer.write(b"Content-Length: nope\\r\\n")
+            framed(response)
+        elif i % 2:
+            print(json.dumps(response), flush=True)
+        else:
+            framed(response)
+    """
+
+    async def check(gateway, server):
+        for n in range(4):
+            assert await call(gateway, server, "echo", {"n": n}) == {"n": n}
+
+    asyncio.run(with_stub(check, body))
+
+
+def test_truncated_frame_fails_pending_requests() -> None:
+    body = """
+    sys.stdin.readline()
+    sys.stdout.buffer.write(b"Content-Length: 100\\r\\n\\r\\n{}")
+    sys.stdout.flush()
+    """
+
+    async def check(gateway, server):
+        with pytest.raises(Exception, match="Empty response"):
+            await call(gateway, server, "echo")
+
+    asyncio.run(with_stub(check, body))
@@ -4,6 +4,6 @@ This module defines a custom reasoning and action agent graph.
 It invokes tools in a simple loop.
 """
 
-from react_agent.graph import graph
+from react_agent.graph import build_graph
 
-__all__ = ["graph"]
+__all__ = ["build_graph"]
@@ -53,7 +53,7 @@ class Configuration:
         """Create a Configuration instance from a RunnableConfig object."""
         config = ensure_config(config)
         configurable = config.get("configurable") or {}
-        _fields = {f.name for f in fields(cls) if f.init}
+        _fields = _INIT_FIELD_NAMES if cls is Configuration else {f.name for f in fields(cls) if f.init}
         return cls(**{k: v for k, v in configurable.items() if k in _fields})
 
     @classmethod
@@ -81,3 +81,8 @@ class Configuration:
             config.mcp_gateway_url = config_data['mcp'].get('gateway_url', config.mcp_gateway_url)
 
         return config
+
+
+
+# Init field names, computed once rather than on every from_runnable_config call
+_INIT_FIELD_NAMES = frozenset(f.name for f in fields(Configuration) if f.init)
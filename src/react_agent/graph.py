@@ -4,84 +4,94 @@ Works with a chat model with tool calling support.
 """
 
 from datetime import datetime, timezone
-from typing import Dict, List, Literal, cast
-import asyncio
+from typing import Any, Awaitable, Dict, List, Literal, Optional, Protocol, Tuple, cast
 
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
 from langgraph.graph import StateGraph
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import ToolNode
 
 from react_agent.configuration import Configuration
 from react_agent.state import InputState, State
-from react_agent.tools import TOOLS, initialize_tools
+from react_agent.tools import initialize_tools
 from react_agent.utils import load_chat_model
 
 
-# Initialize MCP tools when module is loaded
-config = Configuration.load_from_langgraph_json()  # Load from langgraph.json
-asyncio.run(initialize_tools(config))
+class _CallModelNode(Protocol):
+    """Signature of the model-calling node, as accepted by `StateGraph.add_node`."""
 
-async def call_model(
-    state: State, config: RunnableConfig
-) -> Dict[str, List[AIMessage]]:
-    """Call the LLM powering our "agent".
+    def __call__(
+        self, state: State, config: RunnableConfig
+    ) -> Awaitable[Dict[str, List[AIMessage]]]: ...
 
-    This function prepares the prompt, initializes the model, and processes the response.
+
+def _make_call_model(tools: List[BaseTool]) -> _CallModelNode:
+    """Create the model-calling node with `tools` bound to the chat model.
+
+    Bound models are cached per model name and base URL, so each turn reuses them.
 
     Args:
-        state (State): The current state of the conversation.
-        config (RunnableConfig): Configuration for the model run.
+        tools (List[BaseTool]): The tools to bind to the chat model.
 
     Returns:
-        dict: A dictionary containing the model's response message.
+        The `call_model` node function.
     """
-    configuration = Configuration.from_runnable_config(config)
-
-    # Initialize the model with tool binding. Change the model or add more tools here.
-    model = load_chat_model(
-        configuration.model,
-        configuration.openrouter_base_url
-    ).bind_tools(TOOLS)
-
-    # Format the system prompt. Customize this to change the agent's behavior.
-    system_message = configuration.system_prompt.format(
-        system_time=datetime.now(tz=timezone.utc).isoformat()
-    )
-
-    # Get the model's response
-    response = cast(
-        AIMessage,
-        await model.ainvoke(
-            [{"role": "system", "content": system_message}, *state.messages], config
-        ),
-    )
-
-    # Handle the case when it's the last step and the model still wants to use a tool
-    if state.is_last_step and response.tool_calls:
-        return {
-            "messages": [
-                AIMessage(
-                    id=response.id,
-                    content="Sorry, I could not find an answer to your question in the specified number of steps.",
-                )
-            ]
-        }
-
-    # Return the model's response as a list to be added to existing messages
-    return {"messages": [response]}
+    models: Dict[Tuple[str, str], Any] = {}
+
+    async def call_model(
+        state: State, config: RunnableConfig
+    ) -> Dict[str, List[AIMessage]]:
+        """Call the LLM powering our "agent".
+
+        This function prepares the prompt, initializes the model, and processes the response.
+
+        Args:
+            state (State): The current state of the conversation.
+            config (RunnableConfig): Configuration for the model run.
+
+        Returns:
+            dict: A dictionary containing the model's response message.
+        """
+        configuration = Configuration.from_runnable_config(config)
+
+        # Get the model with tool binding, loading it on first use. Change the model here.
+        key = (configuration.model, configuration.openrouter_base_url)
+        model = models.get(key)
+        if model is None:
+            model = models[key] = load_chat_model(*key).bind_tools(tools)
+
+        # Format the system prompt. Customize this to change the agent's behavior.
+        system_message = SystemMessage(
+            content=configuration.system_prompt.format(
+                system_time=datetime.now(tz=timezone.utc).isoformat()
+            )
+        )
 
+        # Get the model's response
+        response = cast(
+            AIMessage,
+            await model.ainvoke(
+                [system_message, *state.messages], config
+            ),
+        )
 
-# Define a new graph
-builder = StateGraph(State, input=InputState, config_schema=Configuration)
+        # Handle the case when it's the last step and the model still wants to use a tool
+        if state.is_last_step and response.tool_calls:
+            return {
+                "messages": [
+                    AIMessage(
+                        id=response.id,
+                        content="Sorry, I could not find an answer to your question in the specified number of steps.",
+                    )
+                ]
+            }
 
-# Define the two nodes we will cycle between
-builder.add_node(call_model)
-builder.add_node("tools", ToolNode(TOOLS))
+        # Return the model's response as a list to be added to existing messages
+        return {"messages": [response]}
 
-# Set the entrypoint as `call_model`
-# This means that this node is the first one called
-builder.add_edge("__start__", "call_model")
+    return call_model
 
 
 def route_model_output(state: State) -> Literal["__end__", "tools"]:
@@ -107,21 +117,55 @@ def route_model_output(state: State) -> Literal["__end__", "tools"]:
     return "tools"
 
 
-# Add a conditional edge to determine the next step after `call_model`
-builder.add_conditional_edges(
-    "call_model",
-    # After call_model finishes running, the next node(s) are scheduled
-    # based on the output from route_model_output
-    route_model_output,
-)
-
-# Add a normal edge from `tools` to `call_model`
-# This creates a cycle: after using tools, we always return to the model
-builder.add_edge("tools", "call_model")
-
-# Compile the builder into an executable graph
-graph = builder.compile(
-    interrupt_before=[],  # Add node names here to update state before they're called
-    interrupt_after=[],  # Add node names here to update state after they're called
-)
-graph.name = "ReAct Agent"  # This customizes the name in LangSmith
+# Compiled graph, built on the first call to `build_graph`
+_graph: Optional[CompiledStateGraph[State, None, State, State]] = None
+
+
+async def build_graph() -> CompiledStateGraph[State, None, State, State]:
+    """Initialize MCP tools and compile the agent graph.
+
+    Tools are loaded from the MCP gateway on the running event loop, so this
+    must be awaited rather than run at import time. LangGraph calls graph
+    factories per run, so the compiled graph is built once and reused.
+
+    Returns:
+        CompiledStateGraph: The compiled ReAct agent graph.
+    """
+    global _graph
+    if _graph is not None:
+        return _graph
+
+    # Initialize MCP tools from the gateway configured in langgraph.json
+    tools = await initialize_tools(Configuration.load_from_langgraph_json())
+
+    # Define a new graph
+    builder = StateGraph(State, input=InputState, config_schema=Configuration)
+
+    # Define the two nodes we will cycle between
+    builder.add_node("call_model", _make_call_model(tools))
+    builder.add_node("tools", ToolNode(tools))
+
+    # Set the entrypoint as `call_model`
+    # This means that this node is the first one called
+    builder.add_edge("__start__", "call_model")
+
+    # Add a conditional edge to determine the next step after `call_model`
+    builder.add_conditional_edges(
+        "call_model",
+        # After call_model finishes running, the next node(s) are scheduled
+        # based on the output from route_model_output
+        route_model_output,
+    )
+
+    # Add a normal edge from `tools` to `call_model`
+    # This creates a cycle: after using tools, we always return to the model
+    builder.add_edge("tools", "call_model")
+
+    # Compile the builder into an executable graph
+    graph = builder.compile(
+        interrupt_before=[],  # Add node names here to update state before they're called
+        interrupt_after=[],  # Add node names here to update state after they're called
+    )
+    graph.name = "ReAct Agent"  # This customizes the name in LangSmith
+    _graph = graph
+    return graph
@@ -3,6 +3,7 @@
 This module handles communication with the MCP gateway server.
 """
 
+import asyncio
 import json
 import logging
 from typing import Any, Dict, List, Optional
@@ -23,20 +24,40 @@ class MCPGatewayClient:
         """
         self.gateway_url = gateway_url
         self.client = httpx.Client()
+        # Created lazily, since its connection pool is bound to one event loop
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
         self._tools: Optional[List[Dict[str, Any]]] = None
     
-    def _send_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        """Send a request to the gateway server.
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the async HTTP client for the running event loop.
+        
+        Returns:
+            An AsyncClient whose connections belong to the current loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            # A client from a previous loop can't be reused or closed here; drop it
+            self._async_client = httpx.AsyncClient()
+            self._async_client_loop = loop
+        return self._async_client
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client if one is open on the running loop."""
+        if self._async_client is not None and self._async_client_loop is asyncio.get_running_loop():
+            await self._async_client.aclose()
+        self._async_client = None
+        self._async_client_loop = None
+    
+    def _build_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build the keyword arguments for posting a request to the gateway.
         
         Args:
             method: The method to call (e.g., "tools/list", "tools/call")
             params: Optional parameters for the method
             
         Returns:
-            The response from the server
-            
-        Raises:
-            Exception: If the request fails
+            Keyword arguments for an httpx ``post`` call
         """
         request = {
             "method": method,
@@ -46,17 +67,62 @@ class MCPGatewayClient:
         # Log the request being sent
         logger.info(f"Sending request to gateway: {json.dumps(request, indent=2)}")
         
-        response = self.client.post(
-            f"{self.gateway_url}/message",
-            json=request,
-            headers={"Content-Type": "application/json"}
-        )
+        return {
+            "url": f"{self.gateway_url}/message",
+            "json": request,
+            "headers": {"Content-Type": "application/json"}
+        }
+    
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> Any:
+        """Check a gateway response and decode its body.
         
+        Args:
+            response: The HTTP response from the gateway
+            
+        Returns:
+            The decoded response body
+            
+        Raises:
+            Exception: If the request failed
+        """
         if response.status_code != 200:
             raise Exception(f"Request failed with status {response.status_code}: {response.text}")
             
         return response.json()
     
+    def _send_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Send a request to the gateway server.
+        
+        Args:
+            method: The method to call (e.g., "tools/list", "tools/call")
+            params: Optional parameters for the method
+            
+        Returns:
+            The response from the server
+            
+        Raises:
+            Exception: If the request fails
+        """
+        response = self.client.post(**self._build_request(method, params))
+        return self._parse_response(response)
+    
+    async def _asend_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Send a request to the gateway server without blocking the event loop.
+        
+        Args:
+            method: The method to call (e.g., "tools/list", "tools/call")
+            params: Optional parameters for the method
+            
+        Returns:
+            The response from the server
+            
+        Raises:
+            Exception: If the request fails
+        """
+        response = await self._get_async_client().post(**self._build_request(method, params))
+        return self._parse_response(response)
+    
     def list_tools(self) -> List[Dict[str, Any]]:
         """Get list of available tools from the gateway.
         
@@ -68,18 +134,29 @@ class MCPGatewayClient:
             self._tools = response.get("tools", [])
         return self._tools
     
-    def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
-        """Call a tool through the gateway.
+    async def alist_tools(self) -> List[Dict[str, Any]]:
+        """Get list of available tools from the gateway asynchronously.
+        
+        Returns:
+            List of tool definitions
+        """
+        if self._tools is None:
+            response = await self._asend_request("tools/list")
+            self._tools = response.get("tools", [])
+        return self._tools
+    
+    def _build_call_params(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate tool arguments and build the tools/call parameters.
         
         Args:
             name: Name of the tool to call
             arguments: Arguments to pass to the tool
             
         Returns:
-            The tool's response
+            The parameters for a tools/call request
             
         Raises:
-            Exception: If the tool call fails
+            Exception: If the arguments are not a dictionary or valid JSON object
         """
         # Log the incoming arguments
         logger.info(f"call_tool received arguments: {json.dumps(arguments, indent=2)}")
@@ -105,10 +182,18 @@ class MCPGatewayClient:
         
         # Log the actual parameters being sent
         logger.info(f"Sending parameters to gateway: {json.dumps(params, indent=2)}")
+        return params
+    
+    @staticmethod
+    def _extract_content(response: Any) -> Any:
+        """Extract text content from a tools/call response.
         
-        response = self._send_request("tools/call", params)
-        
-        # Extract text content from response
+        Args:
+            response: The gateway's response
+            
+        Returns:
+            The text of the first content item, or the raw response
+        """
         if isinstance(response, dict):
             content = response.get("content", [])
             if content and isinstance(content, list):
@@ -117,6 +202,42 @@ class MCPGatewayClient:
                     return first_content.get("text")
         
         return response
+    
+    def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool through the gateway.
+        
+        Args:
+            name: Name of the tool to call
+            arguments: Arguments to pass to the tool
+            
+        Returns:
+            The tool's response
+            
+        Raises:
+            Exception: If the tool call fails
+        """
+        params = self._build_call_params(name, arguments)
+        response = self._send_request("tools/call", params)
+        return self._extract_content(response)
+    
+    async def acall_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool through the gateway asynchronously.
+        
+        Concurrent calls run in parallel instead of blocking the event loop.
+        
+        Args:
+            name: Name of the tool to call
+            arguments: Arguments to pass to the tool
+            
+        Returns:
+            The tool's response
+            
+        Raises:
+            Exception: If the tool call fails
+        """
+        params = self._build_call_params(name, arguments)
+        response = await self._asend_request("tools/call", params)
+        return self._extract_content(response)
 
 
 # Global client instance
@@ -147,6 +268,15 @@ def list_tools() -> List[Dict[str, Any]]:
     return get_client().list_tools()
 
 
+async def alist_tools() -> List[Dict[str, Any]]:
+    """Get list of available tools asynchronously.
+    
+    Returns:
+        List of tool definitions
+    """
+    return await get_client().alist_tools()
+
+
 def call_tool(name: str, arguments: Dict[str, Any]) -> Any:
     """Call a tool through the gateway.
     
@@ -158,3 +288,16 @@ def call_tool(name: str, arguments: Dict[str, Any]) -> Any:
         The tool's response
     """
     return get_client().call_tool(name, arguments)
+
+
+async def acall_tool(name: str, arguments: Dict[str, Any]) -> Any:
+    """Call a tool through the gateway asynchronously.
+    
+    Args:
+        name: Name of the tool to call
+        arguments: Arguments to pass to the tool
+        
+    Returns:
+        The tool's response
+    """
+    return await get_client().acall_tool(name, arguments)
@@ -82,7 +82,7 @@ def _create_tool_wrapper(tool_def: Dict[str, Any]) -> BaseTool:
                 logger.info(f"Merged dict arg with kwargs: {args[0]}")
         
         logger.info(f"Tool wrapper calling with kwargs: {kwargs}")
-        result = mcp_client.call_tool(tool_def["name"], kwargs)
+        result = await mcp_client.acall_tool(tool_def["name"], kwargs)
         return result
     
     # Create Pydantic model for schema validation
@@ -113,26 +113,23 @@ def _create_tool_wrapper(tool_def: Dict[str, Any]) -> BaseTool:
     return tool
 
 
-def _load_tools() -> List[BaseTool]:
+async def _load_tools() -> List[BaseTool]:
     """Load all available tools from the MCP gateway.
     
     Returns:
         List of LangChain tools
     """
     logger.info("Loading tools from gateway")
-    tools = []
-    tool_names = []
-    for tool_def in mcp_client.list_tools():
+    tools_by_name: Dict[str, BaseTool] = {}
+    for tool_def in await mcp_client.alist_tools():
         logger.info(f"Loading tool: {tool_def['name']}")
-        if tool_def['name'] in tool_names:
+        if tool_def['name'] in tools_by_name:
             continue
 
-        tool_names.append(tool_def['name'])
-        tool = _create_tool_wrapper(tool_def)
-        tools.append(tool)
+        tools_by_name[tool_def['name']] = _create_tool_wrapper(tool_def)
 
-    logger.info(tool_names)
-    return tools
+    logger.info(list(tools_by_name))
+    return list(tools_by_name.values())
 
 
 # Initial empty tools list - will be populated during startup
@@ -150,16 +147,14 @@ async def initialize_tools(config) -> List[BaseTool]:
     Returns:
         List of available tools
     """
-    global TOOLS
-    
     logger.info("Initializing tools")
     
     # Configure MCP client with gateway URL from config
     if hasattr(config, "mcp_gateway_url"):
         mcp_client.get_client(config.mcp_gateway_url)
     
-    # Load tools from gateway
-    TOOLS = _load_tools()
+    # Load tools from gateway, updating in place so modules that imported TOOLS see them
+    TOOLS[:] = await _load_tools()
 
     logger.info(f"Initialized {len(TOOLS)} tools")
     return TOOLS
@@ -1,12 +1,13 @@
 import pytest
 from langsmith import unit
 
-from react_agent import graph
+from react_agent import build_graph
 
 
 @pytest.mark.asyncio
 @unit
 async def test_react_agent_simple_passthrough() -> None:
+    graph = await build_graph()
     res = await graph.ainvoke(
         {"messages": [("user", "Who is the founder of LangChain?")]},
         {"configurable": {"system_prompt": "You are a helpful AI assistant."}},